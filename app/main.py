@@ -1,16 +1,26 @@
 from pathlib import Path
-import json
 import os
+import asyncio
+import functools
 import base64
 import zlib
 import hmac
 import hashlib
 import secrets
 import time
-from typing import Dict, List, Tuple
+from collections import OrderedDict, deque
+from itertools import islice, zip_longest
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union, cast
+from urllib.parse import parse_qsl
+
+import orjson
+import xxhash
+import zipstream  # type: ignore[import-untyped]
+import zstandard
 
 from fastapi import FastAPI, Request, HTTPException
-from fastapi.responses import HTMLResponse, StreamingResponse, JSONResponse
+from fastapi.responses import HTMLResponse, StreamingResponse, ORJSONResponse, Response
+from starlette.datastructures import FormData, UploadFile
 from starlette.exceptions import HTTPException as StarletteHTTPException
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
@@ -18,40 +28,136 @@ from fastapi.templating import Jinja2Templates
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 TEMPLATES_DIR = BASE_DIR / "templates"
+STATIC_DIR = BASE_DIR / "static"
 
 
-app = FastAPI(title="PRD++ (pre_prod)")
+app = FastAPI(title="PRD++ (pre_prod)", default_response_class=ORJSONResponse)
 
-# Serve project-root assets (e.g., global.css) under /assets
-app.mount("/assets", StaticFiles(directory=str(BASE_DIR)), name="assets")
+# Serve only the static/ folder (global.css, favicon, manifest) under /assets.
+# In production a reverse proxy can serve this directory directly.
+app.mount("/assets", StaticFiles(directory=str(STATIC_DIR), html=False), name="assets")
 
 templates = Jinja2Templates(directory=str(TEMPLATES_DIR))
+# Hot templates are bound once below, so skip per-render mtime checks as well
+templates.env.auto_reload = False
 
+# Resolve hot-path templates once instead of per request
+INDEX_TPL = templates.env.get_template("index.html")
+PANEL_TPL = templates.env.get_template("partials/panel.html")
+TABS_TPL = templates.env.get_template("partials/tabs.html")
 
-@app.get("/", response_class=HTMLResponse)
-async def index(request: Request) -> HTMLResponse:
-    default_packs = {"pack_core": "on", "pack_opinionated": None, "pack_strict": None}
+# The OOB tabs strip only depends on which tab is active; prerender each one
+TAB_NAMES = ("script", "rules", "scenes", "shots")
+TABS_OOB_HTML = {tab: TABS_TPL.render({"tab": tab, "oob": True}) for tab in TAB_NAMES}
+
+
+def _dumps(obj) -> str:
+    # orjson returns compact UTF-8 bytes; form fields and templates want str
+    return orjson.dumps(obj).decode("utf-8")
+
+
+_loads = orjson.loads
+
+
+def _text_key(value) -> int:
+    # 64-bit xxh3 digest of a form field; far cheaper to hash/compare than the raw text.
+    # Not collision-resistant: only for caches whose values don't echo the input back.
+    return xxhash.xxh3_64_intdigest(str(value).encode("utf-8"))
+
+
+def _content_digest(parts: Iterable[bytes]) -> bytes:
+    # blake2b over length-prefixed parts, for caches that hand a client's document
+    # back to whoever presents a matching key
+    h = hashlib.blake2b(digest_size=32)
+    for data in parts:
+        h.update(len(data).to_bytes(8, "little"))
+        h.update(data)
+    return h.digest()
+
+
+def _keyed_lru_cache(maxsize: int, key):
+    # Like functools.lru_cache, but the cache key is key(*args) rather than the
+    # arguments themselves, so large text inputs are not kept alive as keys.
+    def decorator(fn):
+        cache: OrderedDict = OrderedDict()
+
+        @functools.wraps(fn)
+        def wrapper(*args):
+            k = key(*args)
+            if k in cache:
+                cache.move_to_end(k)
+                return cache[k]
+            value = fn(*args)
+            cache[k] = value
+            if len(cache) > maxsize:
+                cache.popitem(last=False)
+            return value
+
+        wrapper.cache_clear = cache.clear
+        return wrapper
+
+    return decorator
+
+
+MAX_FORM_FIELDS = 1000  # same cap Starlette applies in request.form()
+
+
+async def _read_form(request: Request) -> FormData:
+    # htmx posts urlencoded bodies; parse those directly instead of going through
+    # python-multipart's streaming parser. Multipart bodies (e.g. the share
+    # button's FormData) still use request.form().
+    content_type = request.headers.get("content-type", "")
+    if not content_type.startswith("application/x-www-form-urlencoded"):
+        return await request.form()
+    body = await request.body()
+    try:
+        # latin-1 + percent-decoding as UTF-8 matches Starlette's FormParser
+        pairs = parse_qsl(body.decode("latin-1"), keep_blank_values=True, max_num_fields=MAX_FORM_FIELDS)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Too many fields")
+    # FormData wants the wider (str | UploadFile) value type and list is invariant
+    return FormData(cast(List[Tuple[str, Union[str, UploadFile]]], pairs))
+
+
+def _render_index_html() -> bytes:
     default_result = compute_continuity(
         SCRIPT_DEFAULT,
         RULES_DEFAULT,
         SCENES_DEFAULT,
         SHOTS_DEFAULT,
-        default_packs,
+        PACKS_DEFAULT,
     )
-    return templates.TemplateResponse(
-        "index.html",
+    html = INDEX_TPL.render(
         {
-            "request": request,
             "page_title": "SpecStudio",
             "tab": "script",
             "script_text": SCRIPT_DEFAULT,
             "rules_text": RULES_DEFAULT,
-            "scenes_json": json.dumps(SCENES_DEFAULT),
-            "shots_json": json.dumps(SHOTS_DEFAULT),
-            "packs": default_packs,
+            "scenes_json": SCENES_JSON_DEFAULT,
+            "shots_json": SHOTS_JSON_DEFAULT,
+            "packs": PACKS_DEFAULT,
             "result": default_result,
-        },
+        }
     )
+    return html.encode("utf-8")
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*" or tag == etag or tag == f"W/{etag}":
+            return True
+    return False
+
+
+@app.get("/", response_class=HTMLResponse)
+async def index(request: Request) -> Response:
+    headers = {"ETag": INDEX_ETAG, "Cache-Control": "public, max-age=60"}
+    if _etag_matches(request.headers.get("if-none-match"), INDEX_ETAG):
+        return Response(status_code=304, headers=headers)
+    return HTMLResponse(content=INDEX_HTML_CACHED, headers=headers)
 
 
 # Defaults for editor content
@@ -96,11 +202,11 @@ RULES_DEFAULT = (
     "- Never commit secrets; use .env.example.\n"
 )
 
-SCENES_DEFAULT = [
+SCENES_DEFAULT = (
     {"id": "E1", "title": "Core CRUD", "goal": "Ship item CRUD end-to-end", "risk": "data loss"},
-]
+)
 
-SHOTS_DEFAULT = [
+SHOTS_DEFAULT = (
     {
         "id": "T1",
         "epic_id": "E1",
@@ -127,207 +233,213 @@ SHOTS_DEFAULT = [
             {"text": "Return 4xx/5xx properly", "tag": "error"},
         ],
     },
-]
+)
 
+# Serialized once; used as form fallbacks and for the initial page render
+SCENES_JSON_DEFAULT = _dumps(SCENES_DEFAULT)
+SHOTS_JSON_DEFAULT = _dumps(SHOTS_DEFAULT)
 
-@app.post("/panel", response_class=HTMLResponse)
-async def panel(request: Request) -> HTMLResponse:
-    query_tab = request.query_params.get("tab", "script")
-    form = await request.form()
-    script_text = form.get("script_text", SCRIPT_DEFAULT)
-    rules_text = form.get("rules_text", RULES_DEFAULT)
-    scenes_json = form.get("scenes_json", json.dumps(SCENES_DEFAULT))
-    shots_json = form.get("shots_json", json.dumps(SHOTS_DEFAULT))
+PACK_KEYS = ("pack_core", "pack_opinionated", "pack_strict")
+PACKS_DEFAULT = {"pack_core": "on", "pack_opinionated": None, "pack_strict": None}
+
+
+def _read_packs(form) -> Tuple[Optional[str], ...]:
+    # Pack toggles as a tuple in PACK_KEYS order; the core pack defaults to on
+    core, opinionated, strict = (form.get(k) for k in PACK_KEYS)
+    return (core or "on", opinionated, strict)
+
+
+# --- Panel scene/shot operations ---
+# Each handler takes (items, form, params) and returns (items, editing_item).
+
+
+def _find_by_id(items: List[dict], item_id: Optional[str]) -> Optional[dict]:
+    # Each op does a single lookup, so an early-exit scan beats building an index;
+    # the first item wins when ids are duplicated
+    return next((s for s in items if s.get("id") == item_id), None)
+
+
+def _edit_item(items: List[dict], form, params) -> Tuple[List[dict], Optional[dict]]:
+    return items, _find_by_id(items, params.get("id"))
+
+
+def _delete_item(items: List[dict], form, params) -> Tuple[List[dict], None]:
+    # Remove in place (back to front so indices stay valid) instead of copying the list
+    item_id = params.get("id")
+    for i in range(len(items) - 1, -1, -1):
+        if items[i].get("id") == item_id:
+            del items[i]
+    return items, None
+
+
+def _scene_add(scenes: List[dict], form, params) -> Tuple[List[dict], dict]:
+    new_scene = {
+        "id": f"E{_next_index(scenes, 'E')}",
+        "title": "New Scene",
+        "goal": "Describe the goal",
+        "risk": "tbd",
+    }
+    scenes.append(new_scene)
+    return scenes, new_scene
+
+
+def _scene_save(scenes: List[dict], form, params) -> Tuple[List[dict], None]:
+    get = form.get
+    scene_id_raw, title_raw, goal_raw = get("edit_id"), get("edit_title") or "Untitled", get("edit_goal") or ""
+    original_id = get("original_id") or scene_id_raw
+    scene_id, title, goal = _validate_scene_fields(scene_id_raw, title_raw, goal_raw)
+    target = _find_by_id(scenes, original_id)
+    if target is not None:
+        target.update({"id": scene_id, "title": title, "goal": goal})
+    else:
+        scenes.append({"id": scene_id, "title": title, "goal": goal})
+    return scenes, None
+
+
+def _shot_add(shots: List[dict], form, params) -> Tuple[List[dict], dict]:
+    new_shot = {
+        "id": f"T{_next_index(shots, 'T')}",
+        "epic_id": "E1",
+        "title": "New Shot",
+        "status": "todo",
+        "priority": "P2",
+        "description": "",
+        "checklist": [],
+    }
+    shots.append(new_shot)
+    return shots, new_shot
+
+
+def _shot_from_form(form, fallback_id: Optional[str]) -> dict:
+    # Current (not yet saved) editor values for the shot being edited
+    get = form.get
+    return {
+        "id": _sanitize_shot_id(get("shot_id") or fallback_id or ""),
+        "epic_id": _sanitize_epic_id(get("shot_epic_id") or "E1"),
+        "title": _clamp_text(get("shot_title") or "Untitled", MAX_SHOT_TITLE_LEN),
+        "status": _sanitize_status(get("shot_status") or "todo"),
+        "priority": _sanitize_priority(get("shot_priority") or "P2"),
+        "description": _clamp_text(get("shot_description") or "", MAX_DESCRIPTION_LEN),
+    }
+
+
+def _shot_add_check(shots: List[dict], form, params) -> Tuple[List[dict], dict]:
+    # Rebuild the editing shot from the form and append an empty checklist row
+    base = _shot_from_form(form, params.get("id"))
+    checklist = _read_checklist(form)
+    if len(checklist) < MAX_CHECKLIST_ITEMS:
+        checklist.append({"text": "", "tag": "positive"})
+    base["checklist"] = checklist
+    return shots, base
+
+
+def _shot_remove_check(shots: List[dict], form, params) -> Tuple[List[dict], dict]:
     try:
-        scenes_data = json.loads(scenes_json) if scenes_json else []
-    except json.JSONDecodeError:
-        scenes_data = list(SCENES_DEFAULT)
-        scenes_json = json.dumps(scenes_data)
+        idx = int(params.get("idx"))
+    except Exception:
+        idx = -1
+    base = _shot_from_form(form, params.get("id"))
+    base["checklist"] = _read_checklist(form, skip=idx)
+    return shots, base
+
+
+def _shot_save(shots: List[dict], form, params) -> Tuple[List[dict], None]:
+    original_id = form.get("shot_original_id") or form.get("shot_id")
+    fields = _shot_from_form(form, None)
+    fields["checklist"] = _read_checklist(form)
+    target = _find_by_id(shots, original_id)
+    if target is not None:
+        target.update(fields)
+    else:
+        shots.append(fields)
+    return shots, None
+
+
+def _shot_update_status(shots: List[dict], form, params) -> Tuple[List[dict], None]:
+    shot_id = params.get("id")
+    new_status = _sanitize_status(form.get("status"))
+    target = _find_by_id(shots, shot_id)
+    if target is not None:
+        target["status"] = new_status
+    return shots, None
+
+
+# Keyed by Optional[str] so a missing op can be looked up directly (and misses)
+_PanelOp = Callable[..., Tuple[List[dict], Optional[dict]]]
+
+_SCENE_OPS: Dict[Optional[str], _PanelOp] = {
+    "add": _scene_add,
+    "edit": _edit_item,
+    "save": _scene_save,
+    "delete": _delete_item,
+}
+
+_SHOT_OPS: Dict[Optional[str], _PanelOp] = {
+    "add": _shot_add,
+    "edit": _edit_item,
+    "add_check": _shot_add_check,
+    "remove_check": _shot_remove_check,
+    "save": _shot_save,
+    "update_status": _shot_update_status,
+    "delete": _delete_item,
+}
+
+# Only these ops change the collection; for the rest the submitted JSON is echoed back as-is
+_SCENE_MUTATING_OPS = frozenset(("add", "save", "delete"))
+_SHOT_MUTATING_OPS = frozenset(("add", "save", "update_status", "delete"))
+
+
+def _parse_items(items_json: str, default_json: str) -> Tuple[List[dict], str]:
+    # Invalid JSON falls back to the defaults. Parsing the serialized defaults
+    # gives a fresh deep copy, so ops that edit items in place never touch the
+    # module-level SCENES_DEFAULT/SHOTS_DEFAULT.
     try:
-        shots_data = json.loads(shots_json) if shots_json else []
-    except json.JSONDecodeError:
-        shots_data = list(SHOTS_DEFAULT)
-        shots_json = json.dumps(shots_data)
+        return (_loads(items_json) if items_json else []), items_json
+    except orjson.JSONDecodeError:
+        return _loads(default_json), default_json
+
+
+def _render_panel(
+    query_tab: str,
+    op: Optional[str],
+    form,
+    params,
+    script_text: str,
+    rules_text: str,
+    scenes_json: str,
+    shots_json: str,
+    packs_key: tuple,
+) -> str:
+    # Each collection is only parsed on its own tab; elsewhere the JSON string is
+    # passed through to the hidden form inputs untouched.
+    scenes_data: List[dict] = []
+    shots_data: List[dict] = []
 
     # Handle scenes operations
+    editing_scene = None
     if query_tab == "scenes":
-        op = request.query_params.get("op")
-        editing_scene = None
-        if op == "add":
-            next_index = 1
-            if scenes_data:
-                try:
-                    next_index = max(int(s["id"].lstrip("E")) for s in scenes_data) + 1
-                except Exception:
-                    next_index = len(scenes_data) + 1
-            new_scene = {
-                "id": f"E{next_index}",
-                "title": "New Scene",
-                "goal": "Describe the goal",
-                "risk": "tbd",
-            }
-            scenes_data.append(new_scene)
-            editing_scene = new_scene
-        elif op == "edit":
-            scene_id = request.query_params.get("id")
-            editing_scene = next((s for s in scenes_data if s.get("id") == scene_id), None)
-        elif op == "save":
-            original_id = form.get("original_id") or form.get("edit_id")
-            scene_id_raw = form.get("edit_id")
-            title_raw = form.get("edit_title") or "Untitled"
-            goal_raw = form.get("edit_goal") or ""
-            scene_id, title, goal = _validate_scene_fields(scene_id_raw, title_raw, goal_raw)
-            updated = False
-            for s in scenes_data:
-                if s.get("id") == original_id:
-                    s["id"] = scene_id
-                    s["title"] = title
-                    s["goal"] = goal
-                    updated = True
-                    break
-            if not updated:
-                scenes_data.append({"id": scene_id, "title": title, "goal": goal})
-        elif op == "delete":
-            scene_id = request.query_params.get("id")
-            scenes_data = [s for s in scenes_data if s.get("id") != scene_id]
-        scenes_json = json.dumps(scenes_data)
-    else:
-        editing_scene = None
+        scenes_data, scenes_json = _parse_items(scenes_json, SCENES_JSON_DEFAULT)
+        handler = _SCENE_OPS.get(op)
+        if handler is not None:
+            scenes_data, editing_scene = handler(scenes_data, form, params)
+        if op in _SCENE_MUTATING_OPS:
+            scenes_json = _dumps(scenes_data)
 
     # Handle shots operations
     editing_shot = None
     if query_tab == "shots":
-        op = request.query_params.get("op")
-        if op == "add":
-            next_index = 1
-            if shots_data:
-                try:
-                    next_index = max(int(s["id"].lstrip("T")) for s in shots_data) + 1
-                except Exception:
-                    next_index = len(shots_data) + 1
-            new_shot = {
-                "id": f"T{next_index}",
-                "epic_id": "E1",
-                "title": "New Shot",
-                "status": "todo",
-                "priority": "P2",
-                "description": "",
-                "checklist": [],
-            }
-            shots_data.append(new_shot)
-            editing_shot = new_shot
-        elif op == "edit":
-            shot_id = request.query_params.get("id")
-            editing_shot = next((s for s in shots_data if s.get("id") == shot_id), None)
-        elif op == "add_check":
-            # Build an editing_shot from current form values and append an empty checklist row
-            target_id = request.query_params.get("id")
-            # pull current values (not yet saved) from the form
-            base = {
-                "id": _sanitize_shot_id(form.get("shot_id") or target_id or ""),
-                "epic_id": _sanitize_epic_id(form.get("shot_epic_id") or "E1"),
-                "title": _clamp_text(form.get("shot_title") or "Untitled", MAX_SHOT_TITLE_LEN),
-                "status": _sanitize_status(form.get("shot_status") or "todo"),
-                "priority": _sanitize_priority(form.get("shot_priority") or "P2"),
-                "description": _clamp_text(form.get("shot_description") or "", MAX_DESCRIPTION_LEN),
-            }
-            texts = form.getlist("shot_check_text") if hasattr(form, "getlist") else []
-            tags = form.getlist("shot_check_tag") if hasattr(form, "getlist") else []
-            checklist = _sanitize_checklist(texts, tags)
-            if len(checklist) < MAX_CHECKLIST_ITEMS:
-                checklist.append({"text": "", "tag": "positive"})
-            base["checklist"] = checklist
-            editing_shot = base
-        elif op == "remove_check":
-            target_id = request.query_params.get("id")
-            idx_str = request.query_params.get("idx")
-            try:
-                idx = int(idx_str)
-            except Exception:
-                idx = -1
-            base = {
-                "id": _sanitize_shot_id(form.get("shot_id") or target_id or ""),
-                "epic_id": _sanitize_epic_id(form.get("shot_epic_id") or "E1"),
-                "title": _clamp_text(form.get("shot_title") or "Untitled", MAX_SHOT_TITLE_LEN),
-                "status": _sanitize_status(form.get("shot_status") or "todo"),
-                "priority": _sanitize_priority(form.get("shot_priority") or "P2"),
-                "description": _clamp_text(form.get("shot_description") or "", MAX_DESCRIPTION_LEN),
-            }
-            texts = form.getlist("shot_check_text") if hasattr(form, "getlist") else []
-            tags = form.getlist("shot_check_tag") if hasattr(form, "getlist") else []
-            checklist = []
-            max_items = min(MAX_CHECKLIST_ITEMS, max(len(texts), len(tags)))
-            for i in range(max_items):
-                if i == idx:
-                    continue
-                text = _clamp_text(texts[i] if i < len(texts) else "", MAX_CHECK_TEXT_LEN)
-                tag = (tags[i] if i < len(tags) else "positive")
-                if tag not in {"positive", "negative", "error"}:
-                    tag = "positive"
-                if not text:
-                    continue
-                checklist.append({"text": text, "tag": tag})
-            base["checklist"] = checklist
-            editing_shot = base
-        elif op == "save":
-            original_id = form.get("shot_original_id") or form.get("shot_id")
-            shot_id = _sanitize_shot_id(form.get("shot_id"))
-            epic_id = _sanitize_epic_id(form.get("shot_epic_id") or "E1")
-            title = _clamp_text(form.get("shot_title") or "Untitled", MAX_SHOT_TITLE_LEN)
-            status = _sanitize_status(form.get("shot_status") or "todo")
-            priority = _sanitize_priority(form.get("shot_priority") or "P2")
-            description = _clamp_text(form.get("shot_description") or "", MAX_DESCRIPTION_LEN)
-            texts = form.getlist("shot_check_text") if hasattr(form, "getlist") else []
-            tags = form.getlist("shot_check_tag") if hasattr(form, "getlist") else []
-            checklist = _sanitize_checklist(texts, tags)
-            updated = False
-            for s in shots_data:
-                if s.get("id") == original_id:
-                    s.update({
-                        "id": shot_id,
-                        "epic_id": epic_id,
-                        "title": title,
-                        "status": status,
-                        "priority": priority,
-                        "description": description,
-                        "checklist": checklist,
-                    })
-                    updated = True
-                    break
-            if not updated:
-                shots_data.append({
-                    "id": shot_id,
-                    "epic_id": epic_id,
-                    "title": title,
-                    "status": status,
-                    "priority": priority,
-                    "description": description,
-                    "checklist": checklist,
-                })
-        elif op == "update_status":
-            shot_id = request.query_params.get("id")
-            new_status = (form.get("status") or "todo").lower()
-            if new_status not in {"todo", "doing", "done"}:
-                new_status = "todo"
-            for s in shots_data:
-                if s.get("id") == shot_id:
-                    s["status"] = new_status
-                    break
-        elif op == "delete":
-            shot_id = request.query_params.get("id")
-            shots_data = [s for s in shots_data if s.get("id") != shot_id]
-        shots_json = json.dumps(shots_data)
+        shots_data, shots_json = _parse_items(shots_json, SHOTS_JSON_DEFAULT)
+        handler = _SHOT_OPS.get(op)
+        if handler is not None:
+            shots_data, editing_shot = handler(shots_data, form, params)
+        if op in _SHOT_MUTATING_OPS:
+            shots_json = _dumps(shots_data)
     # Render both the panel and an OOB tabs update, then concatenate.
-    packs = {
-        "pack_core": form.get("pack_core") or "on",
-        "pack_opinionated": form.get("pack_opinionated"),
-        "pack_strict": form.get("pack_strict"),
-    }
-    continuity_result = compute_continuity(script_text, rules_text, scenes_data, shots_data, packs)
+    packs = dict(zip(PACK_KEYS, packs_key))
+    continuity_result = _compute_continuity_cached(script_text, rules_text, scenes_json, shots_json, packs_key)
 
-    panel_html = templates.env.get_template("partials/panel.html").render(
+    panel_html = PANEL_TPL.render(
         {
-            "request": request,
             "tab": query_tab,
             "script_text": script_text,
             "rules_text": rules_text,
@@ -341,49 +453,143 @@ async def panel(request: Request) -> HTMLResponse:
             "result": continuity_result,
         }
     )
-    tabs_html = templates.env.get_template("partials/tabs.html").render(
-        {"request": request, "tab": query_tab, "oob": True}
-    )
-    return HTMLResponse(content=panel_html + tabs_html)
+    tabs_html = TABS_OOB_HTML.get(query_tab)
+    if tabs_html is None:
+        tabs_html = TABS_TPL.render({"tab": query_tab, "oob": True})
+    return panel_html + tabs_html
+
+
+@_keyed_lru_cache(
+    maxsize=32,
+    key=lambda tab, script, rules, scenes, shots, packs: (
+        tab, _content_digest(str(text).encode("utf-8") for text in (script, rules, scenes, shots)), packs
+    ),
+)
+def _render_panel_view(
+    query_tab: str, script_text: str, rules_text: str, scenes_json: str, shots_json: str, packs_key: tuple
+) -> str:
+    # Tab switches (no op) render purely from the submitted state, so reuse the HTML
+    return _render_panel(query_tab, None, None, None, script_text, rules_text, scenes_json, shots_json, packs_key)
+
+
+@app.post("/panel", response_class=HTMLResponse)
+async def panel(request: Request) -> HTMLResponse:
+    query_tab = request.query_params.get("tab", "script")
+    op = request.query_params.get("op")
+    form = await _read_form(request)
+    script_text = form.get("script_text", SCRIPT_DEFAULT)
+    rules_text = form.get("rules_text", RULES_DEFAULT)
+    scenes_json = form.get("scenes_json", SCENES_JSON_DEFAULT)
+    shots_json = form.get("shots_json", SHOTS_JSON_DEFAULT)
+    packs_key = _read_packs(form)
+    if op is None:
+        html = _render_panel_view(query_tab, script_text, rules_text, scenes_json, shots_json, packs_key)
+    else:
+        html = _render_panel(
+            query_tab, op, form, request.query_params, script_text, rules_text, scenes_json, shots_json, packs_key
+        )
+    return HTMLResponse(content=html)
+
+
 def compute_continuity(*args, **kwargs):
     return {"readiness": 100, "issues": []}
 
 
+@_keyed_lru_cache(
+    maxsize=512,
+    key=lambda script, rules, scenes, shots, packs: (
+        _text_key(script), _text_key(rules), _text_key(scenes), _text_key(shots), packs
+    ),
+)
+def _compute_continuity_cached(
+    script_text: str, rules_text: str, scenes_json: str, shots_json: str, packs_key: tuple
+) -> dict:
+    # Keyed on the raw form strings so unchanged editor state skips recomputation.
+    # The result is shared between callers and must be treated as read-only.
+    scenes_data, _ = _parse_items(scenes_json, SCENES_JSON_DEFAULT)
+    shots_data, _ = _parse_items(shots_json, SHOTS_JSON_DEFAULT)
+    return compute_continuity(script_text, rules_text, scenes_data, shots_data, dict(zip(PACK_KEYS, packs_key)))
+
+
+# GET / only depends on module constants, so render it once at import
+INDEX_HTML_CACHED = _render_index_html()
+INDEX_ETAG = f'"{hashlib.blake2b(INDEX_HTML_CACHED, digest_size=16).hexdigest()}"'
+
+
 # continuity endpoint removed
 
+EXPORT_STORE_MAX_BYTES = int(os.getenv("EXPORT_STORE_MAX_BYTES", "65536"))  # 64 KiB default
+
+
+def _export_entries(script_text: str, rules_text: str, scenes_json: str, shots_json: str) -> Dict[str, bytes]:
+    # Compose files per PRD: PRD.md, instructions.mdc, epics.json, tickets.json
+    return {
+        "PRD.md": script_text.encode("utf-8"),
+        ".cursor/rules/instructions.mdc": rules_text.encode("utf-8"),
+        "epics.json": scenes_json.encode("utf-8"),
+        "tickets.json": shots_json.encode("utf-8"),
+    }
+
+
+EXPORT_ZIP_CACHE_SIZE = 16
+# blake2b digest of the encoded entries -> deflated archive. Only touched from the
+# event loop; the build itself runs in a worker thread.
+_EXPORT_ZIP_CACHE: "OrderedDict[bytes, bytes]" = OrderedDict()
+
+
+def _build_deflated_zip(encoded: Dict[str, bytes]) -> bytes:
+    zs = zipstream.ZipStream(compress_type=zipstream.ZIP_DEFLATED, compress_level=1)
+    for path, data in encoded.items():
+        zs.add(data, arcname=path)
+    return b"".join(zs)
+
+
+async def _deflated_export_zip(encoded: Dict[str, bytes]) -> bytes:
+    # Repeat exports of unchanged inputs reuse the archive instead of deflating
+    # again; request bodies are capped at MAX_REQUEST_BYTES, which bounds each entry.
+    # Entry names are fixed, so digesting the bodies alone identifies the archive
+    key = _content_digest(encoded.values())
+    body = _EXPORT_ZIP_CACHE.get(key)
+    if body is not None:
+        _EXPORT_ZIP_CACHE.move_to_end(key)
+        return body
+    body = await asyncio.to_thread(_build_deflated_zip, encoded)
+    _EXPORT_ZIP_CACHE[key] = body
+    if len(_EXPORT_ZIP_CACHE) > EXPORT_ZIP_CACHE_SIZE:
+        _EXPORT_ZIP_CACHE.popitem(last=False)
+    return body
+
 
 @app.post("/export")
-async def export(request: Request) -> StreamingResponse:
+async def export(request: Request) -> Response:
     # Basic rate limit: 10 requests / 60s per IP
     _rate_limit(request, key="export", limit=10, window_seconds=60)
-    form = await request.form()
+    form = await _read_form(request)
     script_text = form.get("script_text", SCRIPT_DEFAULT)
     rules_text = form.get("rules_text", RULES_DEFAULT)
-    scenes_json = form.get("scenes_json", json.dumps(SCENES_DEFAULT))
-    shots_json = form.get("shots_json", json.dumps(SHOTS_DEFAULT))
+    scenes_json = form.get("scenes_json", SCENES_JSON_DEFAULT)
+    shots_json = form.get("shots_json", SHOTS_JSON_DEFAULT)
 
-    # Compose files per PRD: PRD.md, instructions.mdc, epics.json, tickets.json
-    files = {
-        "PRD.md": script_text,
-        ".cursor/rules/instructions.mdc": rules_text,
-        "epics.json": scenes_json,
-        "tickets.json": shots_json,
+    timestamp = time.time_ns() // 1_000_000_000
+    headers = {
+        "Content-Disposition": f"attachment; filename=artifacts_{timestamp}.zip",
     }
-
-    import io, zipfile, time
-
-    buf = io.BytesIO()
-    with zipfile.ZipFile(buf, mode="w", compression=zipfile.ZIP_DEFLATED) as zf:
-        for path, content in files.items():
-            zf.writestr(path, content)
-    buf.seek(0)
-    timestamp = int(time.time())
+    encoded = _export_entries(script_text, rules_text, scenes_json, shots_json)
+    # Deflate costs more CPU than it saves on small text; store those as-is.
+    # Stored archives have a known size up front, so they get a Content-Length
+    # instead of chunked transfer encoding.
+    if sum(len(data) for data in encoded.values()) >= EXPORT_STORE_MAX_BYTES:
+        body = await _deflated_export_zip(encoded)
+        return Response(content=body, media_type="application/zip", headers=headers)
+    zs = zipstream.ZipStream(compress_type=zipstream.ZIP_STORED, sized=True)
+    # Archive is produced lazily as the response body is consumed
+    for path, data in encoded.items():
+        zs.add(data, arcname=path)
+    headers["Content-Length"] = str(len(zs))
     return StreamingResponse(
-        buf,
+        zs,
         media_type="application/zip",
-        headers={
-            "Content-Disposition": f"attachment; filename=artifacts_{timestamp}.zip",
-        },
+        headers=headers,
     )
 
 
@@ -393,30 +599,51 @@ def _b64url_encode(data: bytes) -> str:
     return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
 
 
+# Padding to restore, indexed by len(data) % 4
+_B64_PAD = (b"", b"===", b"==", b"=")
+
+# Share payloads are zstd frames; links minted before the switch are zlib
+# streams, which always start with 0x78 (a zstd frame starts with 0x28).
+_SHARE_ZSTD_LEVEL = 10
+_ZSTD_COMPRESSOR = zstandard.ZstdCompressor(level=_SHARE_ZSTD_LEVEL)
+_ZSTD_DECOMPRESSOR = zstandard.ZstdDecompressor()
+# Payloads above this are compressed off the event loop; below it the thread
+# hop costs more than the compression itself.
+SHARE_OFFLOAD_MIN_BYTES = int(os.getenv("SHARE_OFFLOAD_MIN_BYTES", "65536"))  # 64 KiB default
+
+
+async def _compress_share(data: bytes) -> bytes:
+    if len(data) < SHARE_OFFLOAD_MIN_BYTES:
+        return _ZSTD_COMPRESSOR.compress(data)
+    # A ZstdCompressor must not be shared across threads, so the worker gets its own
+    return await asyncio.to_thread(zstandard.compress, data, _SHARE_ZSTD_LEVEL)
+
+
+def _decompress_share(data: bytes) -> bytes:
+    if data[:1] == b"\x78":
+        return zlib.decompress(data)
+    return _ZSTD_DECOMPRESSOR.decompress(data)
+
+
 def _b64url_decode(data_str: str) -> bytes:
-    padding = "=" * (-len(data_str) % 4)
-    return base64.urlsafe_b64decode(data_str + padding)
+    # Pad the bytes form; b64decode would otherwise re-encode a str argument itself
+    data = data_str.encode("ascii")
+    return base64.urlsafe_b64decode(data + _B64_PAD[len(data) & 3])
 
 
-def _get_share_secret() -> bytes:
-    # Prefer a stable secret if provided; otherwise generate ephemeral per-process
-    secret = os.getenv("SHARE_SECRET")
-    if secret:
-        return secret.encode("utf-8")
-    # Ephemeral fallback is fine for pre-prod/local usage
-    if not hasattr(_get_share_secret, "_cached"):
-        setattr(_get_share_secret, "_cached", secrets.token_urlsafe(32).encode("utf-8"))
-    return getattr(_get_share_secret, "_cached")
+# Prefer a stable secret if provided; otherwise generate ephemeral per-process.
+# The ephemeral fallback is fine for pre-prod/local usage.
+_SHARE_SECRET = (os.getenv("SHARE_SECRET") or secrets.token_urlsafe(32)).encode("utf-8")
 
 
-def _serialize_project(script_text: str, rules_text: str, scenes_json: str, shots_json: str, packs: dict) -> str:
-    # Store as a single JSON string; scenes/shots are passed as JSON strings from the form
+def _serialize_project(script_text: str, rules_text: str, scenes_json: str, shots_json: str, packs: dict) -> bytes:
+    # Store as a single JSON document (bytes); scenes/shots are passed as JSON strings from the form
     try:
-        scenes = json.loads(scenes_json) if scenes_json else []
+        scenes = _loads(scenes_json) if scenes_json else []
     except Exception:
         scenes = []
     try:
-        shots = json.loads(shots_json) if shots_json else []
+        shots = _loads(shots_json) if shots_json else []
     except Exception:
         shots = []
     data = {
@@ -428,62 +655,60 @@ def _serialize_project(script_text: str, rules_text: str, scenes_json: str, shot
         # Version for future compatibility
         "_v": 1,
     }
-    return json.dumps(data, separators=(",", ":"))
+    # Sorted keys make equivalent projects serialize (and so sign) identically
+    return orjson.dumps(data, option=orjson.OPT_SORT_KEYS)
 
 
 @app.post("/api/share")
-async def api_share(request: Request) -> JSONResponse:
+async def api_share(request: Request) -> ORJSONResponse:
     # Basic rate limit: 20 requests / 60s per IP
     _rate_limit(request, key="share", limit=20, window_seconds=60)
-    form = await request.form()
+    form = await _read_form(request)
     script_text = form.get("script_text", SCRIPT_DEFAULT)
     rules_text = form.get("rules_text", RULES_DEFAULT)
-    scenes_json = form.get("scenes_json", json.dumps(SCENES_DEFAULT))
-    shots_json = form.get("shots_json", json.dumps(SHOTS_DEFAULT))
-    packs = {
-        "pack_core": form.get("pack_core") or "on",
-        "pack_opinionated": form.get("pack_opinionated"),
-        "pack_strict": form.get("pack_strict"),
-    }
+    scenes_json = form.get("scenes_json", SCENES_JSON_DEFAULT)
+    shots_json = form.get("shots_json", SHOTS_JSON_DEFAULT)
+    packs = dict(zip(PACK_KEYS, _read_packs(form)))
 
     payload_json = _serialize_project(script_text, rules_text, scenes_json, shots_json, packs)
-    compressed = zlib.compress(payload_json.encode("utf-8"), level=9)
+    compressed = await _compress_share(payload_json)
     payload = _b64url_encode(compressed)
 
-    secret = _get_share_secret()
-    sig_bytes = hmac.new(secret, payload.encode("ascii"), hashlib.sha256).digest()
+    sig_bytes = hmac.digest(_SHARE_SECRET, payload.encode("ascii"), "sha256")
     sig = _b64url_encode(sig_bytes)
-    short_id = hashlib.sha256(compressed).hexdigest()[:8]
+    short_id = hashlib.blake2b(compressed, digest_size=4).hexdigest()
 
     base = str(request.base_url).rstrip("/")
     url = f"{base}/#p={short_id}.{payload}.{sig}"
-    return JSONResponse({"id": short_id, "url": url, "payload": payload, "sig": sig})
+    return ORJSONResponse({"id": short_id, "url": url, "payload": payload, "sig": sig})
 
 
 @app.get("/api/decode")
-async def api_decode(data: str) -> JSONResponse:
+async def api_decode(data: str) -> ORJSONResponse:
     # data format: <id>.<payload>.<sig>
     try:
         parts = data.split(".", 2)
         if len(parts) != 3:
             raise ValueError("invalid format")
         _id, payload, sig = parts
-        secret = _get_share_secret()
-        expected_sig = _b64url_encode(hmac.new(secret, payload.encode("ascii"), hashlib.sha256).digest())
-        if not hmac.compare_digest(sig, expected_sig):
+        expected_sig = hmac.digest(_SHARE_SECRET, payload.encode("ascii"), "sha256")
+        if not hmac.compare_digest(_b64url_decode(sig), expected_sig):
             raise ValueError("bad signature")
-        decompressed = zlib.decompress(_b64url_decode(payload))
-        obj = json.loads(decompressed)
-        return JSONResponse(obj)
+        decompressed = _decompress_share(_b64url_decode(payload))
+        obj = _loads(decompressed)
+        return ORJSONResponse(obj)
     except Exception as exc:
         raise HTTPException(status_code=400, detail=f"Invalid share data: {exc}")
 
 
 # --- Healthcheck and error pages ---
 
+_HEALTH_BODY = orjson.dumps({"status": "ok"})
+
+
 @app.get("/health")
-async def health() -> JSONResponse:
-    return JSONResponse({"status": "ok"})
+async def health() -> Response:
+    return Response(content=_HEALTH_BODY, media_type="application/json")
 
 
 @app.exception_handler(StarletteHTTPException)
@@ -503,7 +728,7 @@ async def http_error_handler(request: Request, exc: StarletteHTTPException):
         )
     except Exception:
         # Fallback to JSON if template fails for any reason
-        return JSONResponse({"error": str(exc.detail) if hasattr(exc, "detail") else str(exc)}, status_code=exc.status_code)
+        return ORJSONResponse({"error": str(exc.detail) if hasattr(exc, "detail") else str(exc)}, status_code=exc.status_code)
 
 
 @app.exception_handler(Exception)
@@ -521,7 +746,7 @@ async def unhandled_error_handler(request: Request, exc: Exception):
             status_code=500,
         )
     except Exception:
-        return JSONResponse({"error": "internal server error"}, status_code=500)
+        return ORJSONResponse({"error": "internal server error"}, status_code=500)
 
 
 # --- Input caps, validation, and basic rate limiting ---
@@ -535,16 +760,36 @@ MAX_SCENE_TITLE_LEN = int(os.getenv("MAX_SCENE_TITLE_LEN", "200"))
 MAX_SCENE_GOAL_LEN = int(os.getenv("MAX_SCENE_GOAL_LEN", "400"))
 
 
-@app.middleware("http")
-async def limit_request_size(request, call_next):
-    try:
-        content_length = request.headers.get("content-length")
-        if content_length is not None and int(content_length) > MAX_REQUEST_BYTES:
-            return JSONResponse({"error": "request too large"}, status_code=413)
-    except Exception:
-        pass
-    response = await call_next(request)
-    return response
+_BODYLESS_METHODS = frozenset(("GET", "HEAD", "OPTIONS"))
+
+
+class LimitRequestSizeMiddleware:
+    # Plain ASGI rather than @app.middleware("http"): safe methods and static
+    # assets pass straight through without the per-request call_next wrapping.
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if (
+            scope["type"] == "http"
+            and scope["method"] not in _BODYLESS_METHODS
+            and not scope["path"].startswith("/assets")
+        ):
+            for name, value in scope["headers"]:
+                if name == b"content-length":
+                    try:
+                        too_large = int(value) > MAX_REQUEST_BYTES
+                    except ValueError:
+                        too_large = False
+                    if too_large:
+                        response = ORJSONResponse({"error": "request too large"}, status_code=413)
+                        await response(scope, receive, send)
+                        return
+                    break
+        await self.app(scope, receive, send)
+
+
+app.add_middleware(LimitRequestSizeMiddleware)
 
 
 def _clamp_text(value: str, max_len: int) -> str:
@@ -553,14 +798,18 @@ def _clamp_text(value: str, max_len: int) -> str:
     return value[:max_len]
 
 
+# canonical -> canonical, so sanitizing is a single dict lookup with a default
+_STATUS_MAP = {s: s for s in ("todo", "doing", "done")}
+_PRIORITY_MAP = {p: p for p in ("P1", "P2", "P3")}
+_TAGS = frozenset(("positive", "negative", "error"))
+
+
 def _sanitize_status(value: str) -> str:
-    v = (value or "").lower()
-    return v if v in {"todo", "doing", "done"} else "todo"
+    return _STATUS_MAP.get(value.lower() if value else "", "todo")
 
 
 def _sanitize_priority(value: str) -> str:
-    v = (value or "").upper()
-    return v if v in {"P1", "P2", "P3"} else "P2"
+    return _PRIORITY_MAP.get(value.upper() if value else "", "P2")
 
 
 def _sanitize_epic_id(value: str) -> str:
@@ -577,18 +826,34 @@ def _sanitize_shot_id(value: str) -> str:
     return v[:16]
 
 
-def _sanitize_checklist(texts: List[str], tags: List[str]) -> List[dict]:
-    items: List[dict] = []
-    max_items = min(MAX_CHECKLIST_ITEMS, max(len(texts), len(tags)))
-    for i in range(max_items):
-        text = _clamp_text(texts[i] if i < len(texts) else "", MAX_CHECK_TEXT_LEN)
-        tag = (tags[i] if i < len(tags) else "positive")
-        if tag not in {"positive", "negative", "error"}:
-            tag = "positive"
-        if not text:
-            continue
-        items.append({"text": text, "tag": tag})
-    return items
+def _next_index(items: List[dict], prefix: str) -> int:
+    # Single pass over ids like "E3"/"T12"; malformed ids are skipped rather than raising
+    highest = 0
+    for item in items:
+        sid = item.get("id") if isinstance(item, dict) else None
+        if isinstance(sid, str) and sid.startswith(prefix):
+            digits = sid[len(prefix):]
+            if digits.isdigit():
+                value = int(digits)
+                if value > highest:
+                    highest = value
+    return highest + 1
+
+
+def _sanitize_checklist(texts: List[str], tags: List[str], skip: int = -1) -> List[dict]:
+    # Rows pair up positionally; `skip` drops one raw row index (remove_check)
+    rows = islice(zip_longest(texts, tags, fillvalue=""), MAX_CHECKLIST_ITEMS)
+    return [
+        {"text": t, "tag": tag if tag in _TAGS else "positive"}
+        for i, (text, tag) in enumerate(rows)
+        if i != skip and (t := _clamp_text(text, MAX_CHECK_TEXT_LEN))
+    ]
+
+
+def _read_checklist(form, skip: int = -1) -> List[dict]:
+    texts = form.getlist("shot_check_text") if hasattr(form, "getlist") else []
+    tags = form.getlist("shot_check_tag") if hasattr(form, "getlist") else []
+    return _sanitize_checklist(texts, tags, skip)
 
 
 def _validate_scene_fields(scene_id: str, title: str, goal: str) -> Tuple[str, str, str]:
@@ -599,13 +864,15 @@ def _validate_scene_fields(scene_id: str, title: str, goal: str) -> Tuple[str, s
     return sid, _clamp_text(title or "Untitled", MAX_SCENE_TITLE_LEN), _clamp_text(goal or "", MAX_SCENE_GOAL_LEN)
 
 
-_RATE_LIMIT_BUCKETS: Dict[Tuple[str, str], List[float]] = {}
+RATE_LIMIT_MAX_BUCKETS = int(os.getenv("RATE_LIMIT_MAX_BUCKETS", "10000"))
+# LRU of (ip, key) -> recent hit timestamps; each deque holds at most `limit` hits
+_RATE_LIMIT_BUCKETS: "OrderedDict[Tuple[str, str], deque]" = OrderedDict()
 
 
 def _client_ip(request: Request) -> str:
     xfwd = request.headers.get("x-forwarded-for")
     if xfwd:
-        return xfwd.split(",")[0].strip()
+        return xfwd.partition(",")[0].strip()
     return getattr(request.client, "host", "unknown")
 
 
@@ -613,12 +880,15 @@ def _rate_limit(request: Request, key: str, limit: int, window_seconds: int) ->
     now = time.time()
     ip = _client_ip(request)
     bucket_key = (ip, key)
-    entries = _RATE_LIMIT_BUCKETS.get(bucket_key, [])
-    # prune
-    threshold = now - window_seconds
-    entries = [t for t in entries if t >= threshold]
-    if len(entries) >= limit:
+    entries = _RATE_LIMIT_BUCKETS.get(bucket_key)
+    if entries is None:
+        entries = _RATE_LIMIT_BUCKETS[bucket_key] = deque(maxlen=limit)
+        if len(_RATE_LIMIT_BUCKETS) > RATE_LIMIT_MAX_BUCKETS:
+            _RATE_LIMIT_BUCKETS.popitem(last=False)
+    else:
+        _RATE_LIMIT_BUCKETS.move_to_end(bucket_key)
+    # the oldest of the last `limit` hits still inside the window means we're full
+    if len(entries) == limit and entries[0] >= now - window_seconds:
         raise HTTPException(status_code=429, detail="rate limit exceeded")
     entries.append(now)
-    _RATE_LIMIT_BUCKETS[bucket_key] = entries
 